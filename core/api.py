@@ -124,6 +124,27 @@ def _temp_env(**pairs):
                 os.environ[k] = v
 
 
+def _seed_db(db, values):
+    """
+    Write request-supplied db keys in one transaction, so seeding costs one
+    commit instead of a serialize-and-commit per key.
+    """
+    if not values:
+        return
+    if hasattr(db, 'begin_transaction'):
+        db.begin_transaction()
+        try:
+            for k, v in values.items():
+                db[k] = v
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+    else:
+        for k, v in values.items():
+            db[k] = v
+
+
 def execute_api(protocol_name, method, path, data=None, params=None):
     """Execute an API request against a protocol using its api.yaml mapping."""
     protocol_path = Path("protocols") / protocol_name
@@ -179,8 +200,7 @@ def execute_api(protocol_name, method, path, data=None, params=None):
                 db = create_db(db_path=db_path, protocol_name=protocol_name)
 
                 if data and isinstance(data.get("db"), dict):
-                    for k, v in data["db"].items():
-                        db[k] = v
+                    _seed_db(db, data["db"])
 
                 time_now_ms = (data or {}).get("time_now_ms")
                 run_tick(db, time_now_ms=time_now_ms)
@@ -209,8 +229,7 @@ def execute_api(protocol_name, method, path, data=None, params=None):
             db = create_db(db_path=db_path, protocol_name=protocol_name)
 
             if data and isinstance(data.get("db"), dict):
-                for k, v in data["db"].items():
-                    db[k] = v
+                _seed_db(db, data["db"])
 
             db, result = run_command(handler_name, command_name, input_data, db)
 
@@ -30,7 +30,7 @@ class SQLSchemaParser:
         content = re.sub(r'--.*$', '', content, flags=re.MULTILINE)
         
         # Find all CREATE TABLE statements
-        table_pattern = r'CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)\s*\((.*?)\);'
+        table_pattern = r'CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)\s*\((.*?)\)\s*(?:WITHOUT\s+ROWID\s*)?;'
         
         for match in re.finditer(table_pattern, content, re.IGNORECASE | re.DOTALL):
             table_name = match.group(1).lower()
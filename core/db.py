@@ -28,8 +28,9 @@ class PersistentDict(MutableMapping):
         """
         self.db_path = db_path
         self.protocol_name = protocol_name
-        # Use timeout to avoid database locked errors
-        self.conn = sqlite3.connect(db_path, timeout=10.0)
+        # Use timeout to avoid database locked errors; a larger statement
+        # cache keeps every handler's hoisted SQL prepared across events
+        self.conn = sqlite3.connect(db_path, timeout=10.0, cached_statements=256)
         self.conn.row_factory = sqlite3.Row
         
         # SQLite pragmas for concurrency + durability
@@ -38,6 +39,10 @@ class PersistentDict(MutableMapping):
             self.conn.execute("PRAGMA journal_mode = WAL")
             # NORMAL is a good balance for local apps
             self.conn.execute("PRAGMA synchronous = NORMAL")
+            # Keep temp b-trees (sorts, IN lists) off disk
+            self.conn.execute("PRAGMA temp_store = MEMORY")
+            # Memory-map up to 256 MiB of the file for reads
+            self.conn.execute("PRAGMA mmap_size = 268435456")
             # Enforce transactional safeguards
             self.conn.execute("PRAGMA foreign_keys = ON")
             # Default busy timeout; can be overridden per-operation
@@ -47,6 +52,13 @@ class PersistentDict(MutableMapping):
         except sqlite3.OperationalError:
             pass
         
+        # Shared cursor handed out by cursor()
+        self._cursor = None
+        
+        # Per-connection memo for handler lookups; dropped on rollback so
+        # nothing cached outlives the rows it was read from
+        self.lookup_cache = {}
+        
         # Transaction state
         self._in_transaction = False
         self._transaction_cache = {}
@@ -100,7 +112,7 @@ class PersistentDict(MutableMapping):
                     continue
                 elif in_create_table and stripped.startswith('--'):
                     continue
-                elif in_create_table and (');' in stripped or stripped == ')'):  
+                elif in_create_table and (');' in stripped or stripped.startswith(')')):
                     in_create_table = False
                     if cleaned_lines:
                         prev = cleaned_lines[-1]
@@ -301,6 +313,7 @@ class PersistentDict(MutableMapping):
         try:
             self.conn.rollback()
         finally:
+            self.lookup_cache.clear()
             self._transaction_cache = {}
             self._in_transaction = False
     
@@ -407,8 +420,21 @@ class PersistentDict(MutableMapping):
         self[key] = value  # Trigger persistence
         return value
     
+    def cursor(self):
+        """
+        Return a cursor on this connection, created once and reused.
+        
+        Callers must consume results (e.g. fetchall) before handing control
+        to code that may run its own statement on the same cursor.
+        """
+        cur = self._cursor
+        if cur is None:
+            cur = self._cursor = self.conn.cursor()
+        return cur
+    
     def close(self):
         """Close the SQLite connection if open."""
+        self._cursor = None
         if hasattr(self, 'conn') and self.conn:
             self.conn.close()
             self.conn = None
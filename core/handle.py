@@ -9,12 +9,89 @@ Key changes:
 """
 import importlib.util
 import os
+import sys
 import logging
+from types import MappingProxyType
 from core.handler_discovery import build_handler_map, load_handler_config
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Dispatch caches keyed by absolute handler base path. Routing an envelope is
+# then a dict lookup instead of a directory scan, a JSON config read and a
+# projector module exec on every event.
+_handler_maps = {}
+_projectors = {}
+# Optional `project_batch` callables, cached alongside `project`
+_batch_projectors = {}
+
+# Read-only default for absent envelope parts, so routing does not build a
+# fresh empty dict per event
+_EMPTY = MappingProxyType({})
+
+
+def _get_handler_map(handler_base):
+    """Return the cached event-type -> handler-name map for `handler_base`."""
+    key = os.path.abspath(handler_base)
+    handler_map = _handler_maps.get(key)
+    if handler_map is None:
+        handler_map = _handler_maps[key] = build_handler_map(handler_base)
+    return handler_map
+
+
+def _get_projector(handler_name, handler_base):
+    """
+    Return the cached `project` callable for a handler.
+
+    Returns None when the handler has no config or no projector.py; the caller
+    logs and rolls back in that case.
+    """
+    key = (os.path.abspath(handler_base), handler_name)
+    if key in _projectors:
+        return _projectors[key]
+
+    project = None
+    project_batch = None
+    if load_handler_config(handler_name, handler_base):
+        projector_path = f"{handler_base}/{handler_name}/projector.py"
+        if os.path.exists(projector_path):
+            spec = importlib.util.spec_from_file_location("projector", projector_path)
+            projector_module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(projector_module)
+            project = projector_module.project
+            project_batch = getattr(projector_module, 'project_batch', None)
+    _projectors[key] = project
+    _batch_projectors[key] = project_batch
+    return project
+
+
+def get_projector(event_type):
+    """
+    Return the cached `project` callable for `event_type` under the current
+    HANDLER_PATH, or None when no handler projects that type.
+
+    Lets replay loops call projectors directly, inside a transaction they
+    already own, without handle()'s per-envelope routing.
+    """
+    handler_base = os.environ.get("HANDLER_PATH", "handlers")
+    handler_name = _get_handler_map(handler_base).get(event_type)
+    if not handler_name:
+        return None
+    return _get_projector(handler_name, handler_base)
+
+
+def get_batch_projector(event_type):
+    """
+    Return the cached `project_batch(db, envelopes, time_now_ms)` callable for
+    `event_type`, or None when its projector only handles one envelope.
+    """
+    handler_base = os.environ.get("HANDLER_PATH", "handlers")
+    handler_name = _get_handler_map(handler_base).get(event_type)
+    if not handler_name:
+        return None
+    _get_projector(handler_name, handler_base)
+    return _batch_projectors[(os.path.abspath(handler_base), handler_name)]
+
 
 def handle(db, envelope, time_now_ms, auto_transaction=True):
     """
@@ -31,21 +108,33 @@ def handle(db, envelope, time_now_ms, auto_transaction=True):
     
     try:
         # Check for error in metadata (missing key scenario)
-        if 'error' in envelope.get('metadata', {}):
+        metadata = envelope.get('metadata', _EMPTY)
+        if 'error' in metadata:
             event_type = 'missing_key'
         else:
             # Get event type from data
-            event_type = envelope.get('data', {}).get('type')
+            event_type = envelope.get('data', _EMPTY).get('type')
+            # Intern the type so projector type guards compare by identity
+            if isinstance(event_type, str):
+                event_type = envelope['data']['type'] = sys.intern(event_type)
+        
+        # Intern received_by too; the same few identity pubkeys recur on every event
+        if isinstance(metadata, dict) and isinstance(metadata.get('received_by'), str):
+            metadata['received_by'] = sys.intern(metadata['received_by'])
+        
+        # Read once per event; the test runner toggles TEST_MODE at runtime,
+        # so it cannot be cached at import
+        test_mode = os.environ.get("TEST_MODE")
         
         # Log what we're handling
-        if os.environ.get("TEST_MODE"):
+        if test_mode:
             print(f"[handle] Processing event type: {event_type}")
         
         # Get handler base path (for tests vs production)
         handler_base = os.environ.get("HANDLER_PATH", "handlers")
         
-        # Build handler map dynamically from available handlers
-        handler_map = build_handler_map(handler_base)
+        # Handler map is built once per handler base and then reused
+        handler_map = _get_handler_map(handler_base)
         
         # If no event type, check if unknown handler exists; if not, drop the event
         if not event_type:
@@ -61,7 +150,7 @@ def handle(db, envelope, time_now_ms, auto_transaction=True):
             handler_name = handler_map.get(event_type)
         
         # Log handler mapping
-        if os.environ.get("TEST_MODE"):
+        if test_mode:
             print(f"[handle] Handler map: {handler_map}")
             print(f"[handle] Selected handler: {handler_name} for type: {event_type}")
         
@@ -75,40 +164,23 @@ def handle(db, envelope, time_now_ms, auto_transaction=True):
                     db.rollback()
                 return db
         
-        # Load handler config
-        handler_dir = f"{handler_base}/{handler_name}"
-        config = load_handler_config(handler_name, handler_base)
+        # Resolve the projector once per handler and reuse it for every event
+        project = _get_projector(handler_name, handler_base)
         
-        if not config:
-            logger.error(f'Handler config not found for: {handler_name}')
-            if auto_transaction:
+        if project is None:
+            logger.error(f'Handler config or projector not found for: {handler_name}')
+            if auto_transaction and hasattr(db, 'rollback'):
                 db.rollback()
             return db
         
-        # Load and run projector
-        projector_path = f"{handler_dir}/projector.py"
-        if os.path.exists(projector_path):
-            spec = importlib.util.spec_from_file_location("projector", projector_path)
-            projector_module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(projector_module)
-            
-            # Initialize state if needed
-            if "state" not in db:
-                db["state"] = {}
-            
-            # Run projector with full envelope
-            result = projector_module.project(db, envelope, time_now_ms)
-            if result is not None:
-                db = result
-            
-            # Commit if transaction successful
-            if auto_transaction and hasattr(db, 'commit'):
-                db.commit()
-            
-        else:
-            logger.error(f'Projector not found for handler: {handler_name}')
-            if auto_transaction and hasattr(db, 'rollback'):
-                db.rollback()
+        # Run projector with full envelope
+        result = project(db, envelope, time_now_ms)
+        if result is not None:
+            db = result
+        
+        # Commit if transaction successful
+        if auto_transaction and hasattr(db, 'commit'):
+            db.commit()
             
     except Exception as e:
         # Rollback on any error
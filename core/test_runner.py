@@ -12,6 +12,11 @@ try:
     import yaml
 except Exception:
     yaml = None
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 import re
 import itertools
 from datetime import datetime
@@ -25,6 +30,22 @@ try:
 except Exception:
     pass
 
+def _load_json_file(path):
+    """
+    Parse a JSON test or handler file. Uses orjson on the raw bytes when
+    installed, skipping the text decode; anything orjson rejects (e.g. NaN)
+    is re-parsed with stdlib json, which also raises the usual errors.
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw)
+
+
 class TestRunner:
     def __init__(self):
         self.verbose = False
@@ -1086,8 +1107,7 @@ class TestRunner:
             except Exception:
                 pass
 
-            with open(test_path, 'r') as f:
-                test_data = json.load(f)
+            test_data = _load_json_file(test_path)
             
             # Check if this is a JSON-only test file
             if test_data.get("jsonTestsOnly"):
@@ -1357,8 +1377,7 @@ class TestRunner:
                     handler_json_path = os.path.join(handler_path, f"{handler_dir}_handler.json")
                     if os.path.exists(handler_json_path):
                         try:
-                            with open(handler_json_path, 'r') as f:
-                                handler_data = json.load(f)
+                            handler_data = _load_json_file(handler_json_path)
                             
                             # Extract commands
                             commands = []
@@ -1,25 +1,22 @@
 def execute(input_data, db):
     """
     Retry pending missing key envelopes when key_map has changed.
-    SQL-first against 'pending_missing_key' and 'key_map';
-    falls back to dict state.
+    SQL-only against 'pending_missing_key' and 'key_map'.
     """
     # SQL-only path
     cur = db.conn.cursor()
-    known_rows = cur.execute("SELECT key_hash FROM key_map").fetchall()
-    known_keys = set(r[0] for r in known_rows)
-    pend_rows = cur.execute("SELECT id, missingHash FROM pending_missing_key").fetchall()
-    if not pend_rows:
+    before = cur.execute("SELECT COUNT(1) FROM pending_missing_key").fetchone()[0]
+    if before == 0:
         return {"return": "No pending entries", "processed": 0}
-    ids_to_delete = [r[0] for r in pend_rows if r[1] in known_keys]
-    processed_count = 0
-    if ids_to_delete:
-        cur.execute(
-            f"DELETE FROM pending_missing_key WHERE id IN ({','.join(['?']*len(ids_to_delete))})",
-            ids_to_delete,
-        )
-        processed_count = len(ids_to_delete)
-    remaining = cur.execute("SELECT COUNT(1) FROM pending_missing_key").fetchone()[0]
+    # Match pending entries against key_map by hash in one statement; the
+    # missingHash index and key_map primary key make this a keyed lookup
+    # instead of a Python-side scan over every pending row. The survivors
+    # are the old count minus what was removed, so no recount is needed.
+    deleted = cur.execute(
+        "DELETE FROM pending_missing_key WHERE missingHash IN (SELECT key_hash FROM key_map)"
+    )
+    processed_count = max(0, deleted.rowcount or 0)
+    remaining = max(0, before - processed_count)
 
     return {
         "return": f"Processed {processed_count} entries",
@@ -19,7 +19,7 @@ def execute(input_data, db):
     before = cur.execute("SELECT COUNT(1) FROM unknown_events").fetchone()[0]
     if before == 0:
         return {"return": "No unknown events", "purged": 0}
-    # Purge and count remaining
+    # Purge via the timestamp index and derive remaining from rowcount
     purged = cur.execute(
         "DELETE FROM unknown_events WHERE timestamp <= ?",
         (cutoff_time,),
@@ -28,7 +28,7 @@ def execute(input_data, db):
         purged_count = purged.rowcount if purged and purged.rowcount is not None else 0
     except Exception:
         purged_count = 0
-    remaining = cur.execute("SELECT COUNT(1) FROM unknown_events").fetchone()[0]
+    remaining = max(0, before - purged_count)
 
     return {
         "return": f"Purged {purged_count} events",
@@ -46,8 +46,6 @@ def project(db, envelope, time_now_ms):
     """
     # Get data from envelope
     data = envelope.get('data', {})
-    if data.get('type') != 'identity':
-        return db
 
     pubkey = data.get('pubkey')
     privkey = data.get('privkey')
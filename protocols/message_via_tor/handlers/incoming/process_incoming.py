@@ -1,9 +1,18 @@
 from core.handle import handle
+from typing import Any, NamedTuple
 import uuid
 import time
 import json
 
 
+class IncomingRow(NamedTuple):
+    """A decoded row from the SQL incoming queue."""
+    id: int
+    recipient: str
+    data: Any
+    metadata: dict
+
+
 def execute(input_data, db):
     """
     Process incoming message queue (SQL-backed).
@@ -29,7 +38,7 @@ def execute(input_data, db):
                     metadata = json.loads(metadata) if isinstance(metadata, str) else (metadata or {})
                 except Exception:
                     metadata = {}
-                rows.append({"id": rid, "recipient": recipient, "data": data, "metadata": metadata})
+                rows.append(IncomingRow(rid, recipient, data, metadata))
         except Exception:
             rows = []
 
@@ -37,9 +46,9 @@ def execute(input_data, db):
     for row in rows:
         envelope = {
             "envelope": True,
-            "recipient": row["recipient"],
-            "data": row["data"],
-            "metadata": row["metadata"] or {}
+            "recipient": row.recipient,
+            "data": row.data,
+            "metadata": row.metadata or {}
         }
         if 'eventId' not in envelope['metadata']:
             envelope['metadata']['eventId'] = str(uuid.uuid4())
@@ -47,7 +56,7 @@ def execute(input_data, db):
             envelope['metadata']['timestamp'] = current_time
         # Ensure received_by present
         if 'received_by' not in envelope['metadata']:
-            envelope['metadata']['received_by'] = row["recipient"]
+            envelope['metadata']['received_by'] = row.recipient
 
         db = handle(db, envelope, input_data.get("time_now_ms"), auto_transaction=False)
 
@@ -55,7 +64,7 @@ def execute(input_data, db):
     if hasattr(db, 'conn') and rows:
         try:
             cur = db.conn.cursor()
-            ids = [r['id'] for r in rows]
+            ids = [r.id for r in rows]
             q_marks = ','.join(['?'] * len(ids))
             cur.execute(f"DELETE FROM incoming WHERE id IN ({q_marks})", ids)
             db.conn.commit()
@@ -61,7 +61,7 @@ def execute(input_data, db):
                 "SELECT pubkey FROM peers WHERE received_by = ?",
                 (public_key,)
             ).fetchall()
-            known_peers = [dict(r) for r in rows]
+            known_peers = [r[0] for r in rows]
         except Exception:
             known_peers = []
     # Dict-state deprecated; no fallback
@@ -69,9 +69,7 @@ def execute(input_data, db):
     
     # Create outgoing envelope for each known peer
     sent_count = 0
-    outgoing_list = []
-    for peer in known_peers:
-        peer_pubkey = peer.get('pubkey')
+    for peer_pubkey in known_peers:
         if not peer_pubkey:
             continue
         
@@ -91,7 +89,6 @@ def execute(input_data, db):
         except Exception:
             pass
         sent_count += 1
-        outgoing_list.append({"recipient": peer_pubkey, "data": event_data})
     
     return {
         "api_response": {
@@ -48,13 +48,14 @@ def project(db, envelope, time_now_ms):
     # Get data and metadata from envelope
     data = envelope.get('data', {})
     metadata = envelope.get('metadata', {})
-    if data.get('type') != 'peer':
-        return db
 
     pubkey = data.get('pubkey')
     if not pubkey:
         return db
 
+    has_sql = getattr(db, 'conn', None) is not None
+    cur = db.conn.cursor() if has_sql else None
+
     # Determine which identity received this peer event
     # Allow received_by from metadata or from data (legacy tests)
     received_by = metadata.get('received_by') or data.get('received_by')
@@ -63,9 +64,8 @@ def project(db, envelope, time_now_ms):
         if metadata.get('selfGenerated') and pubkey:
             received_by = pubkey
         # If this peer matches a local identity, default to that identity
-        if not received_by and hasattr(db, 'conn') and pubkey:
+        if not received_by and has_sql and pubkey:
             try:
-                cur = db.conn.cursor()
                 row = cur.execute("SELECT 1 FROM identities WHERE pubkey = ? LIMIT 1", (pubkey,)).fetchone()
                 if row:
                     received_by = pubkey
@@ -79,8 +79,7 @@ def project(db, envelope, time_now_ms):
 
     # Persist to SQL and clear unknown flags on matching messages
     try:
-        if hasattr(db, 'conn'):
-            cur = db.conn.cursor()
+        if has_sql:
             # Insert peer knowledge record
             cur.execute(
                 """
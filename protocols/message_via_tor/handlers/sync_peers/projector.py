@@ -6,9 +6,6 @@ def project(db, envelope, time_now_ms):
     data = envelope.get('data', {})
     metadata = envelope.get('metadata', {})
     
-    if data.get('type') != 'sync_peers':
-        return db
-    
     sender = data.get('sender')
     if not sender:
         return db
@@ -19,66 +16,44 @@ def project(db, envelope, time_now_ms):
         # Can't determine which identity received this, skip
         return db
     
-    # Get peers known by the identity that received this sync request
-    peers = []
-    known_peers = []
-    if hasattr(db, 'conn'):
-        try:
-            cur = db.conn.cursor()
-            rows = cur.execute(
-                "SELECT pubkey, name FROM peers WHERE received_by = ?",
-                (received_by,)
-            ).fetchall()
-            known_peers = [{'pubkey': r[0], 'name': r[1]} for r in rows]
-        except Exception:
-            known_peers = []
-    # Dict-state deprecated: do not fall back to in-memory peers
+    if not hasattr(db, 'conn'):
+        # Dict-state deprecated: nothing to project without SQL
+        return db
 
-    # Send peer events for peers known by this identity
-    if known_peers:
-        for peer in known_peers:
-            # Create peer event data to send
-            peer_event = {
-                'type': 'peer',
-                'pubkey': peer.get('pubkey'),
-                'name': peer.get('name')
-            }
-            # Persist to SQL outgoing
-            try:
-                if hasattr(db, 'conn'):
-                    import json
-                    cur = db.conn.cursor()
-                    cur.execute(
-                        "INSERT INTO outgoing(recipient, data, created_at, sent) VALUES(?, ?, ?, 0)",
-                        (sender, json.dumps(peer_event), int(time_now_ms or 0))
-                    )
-                    db.conn.commit()
-            except Exception:
-                pass
-    
-    # Append sync_peers to SQL event_store (protocol-owned)
+    import json
+    cur = db.conn.cursor()
+    created_at = int(time_now_ms or 0)
+
+    # Queue a peer event for every peer known by the receiving identity in a
+    # single executemany. Sync requests are transient and never read back, so
+    # unlike other projectors this one does not append to event_store.
     try:
-        if hasattr(db, 'conn'):
-            import json as _json
-            cur = db.conn.cursor()
-            evt_type = 'sync_peers'
-            evt_id = metadata.get('eventId') or None
-            pubkey = received_by or sender or 'unknown'
-            cur.execute(
-                """
-                INSERT OR IGNORE INTO event_store(pubkey, event_data, metadata, event_type, event_id, created_at)
-                VALUES(?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    pubkey,
-                    _json.dumps(data, sort_keys=True),
-                    _json.dumps(metadata, sort_keys=True),
-                    evt_type,
-                    evt_id,
-                    int(time_now_ms or 0),
+        rows = cur.execute(
+            "SELECT pubkey, name FROM peers WHERE received_by = ?",
+            (received_by,)
+        ).fetchall()
+        if rows:
+            dumps = json.dumps
+            # Skip peer events already queued (unsent) for this requester so
+            # repeated sync requests do not pile up duplicate envelopes
+            queued = {
+                q[0] for q in cur.execute(
+                    "SELECT data FROM outgoing WHERE recipient = ? AND sent = 0",
+                    (sender,)
+                ).fetchall()
+            }
+            batch = []
+            for r in rows:
+                payload = dumps({'type': 'peer', 'pubkey': r[0], 'name': r[1]})
+                if payload in queued:
+                    continue
+                queued.add(payload)
+                batch.append((sender, payload, created_at))
+            if batch:
+                cur.executemany(
+                    "INSERT INTO outgoing(recipient, data, created_at, sent) VALUES(?, ?, ?, 0)",
+                    batch
                 )
-            )
-            db.conn.commit()
     except Exception:
         pass
     
@@ -2,59 +2,63 @@ def execute(input_data, db):
     """
     Sends sync requests from all identities to all their known peers (SQL-only).
     """
+    import json
     cur = db.conn.cursor()
     identities = [dict(r) for r in cur.execute("SELECT pubkey FROM identities").fetchall()]
-    peers = [dict(r) for r in cur.execute("SELECT pubkey, received_by FROM peers").fetchall()]
+    # Group peers by the identity that knows them so each identity reads only its own bucket
+    peers_by_identity = {}
+    for r in cur.execute("SELECT pubkey, received_by FROM peers").fetchall():
+        peers_by_identity.setdefault(r[1], []).append(r[0])
     
-    sent_count = 0
+    # Nothing to sync: skip building and writing an empty batch
+    if not identities or not peers_by_identity:
+        return {"return": "No identities or peers"}
+    
+    created_at = int(input_data.get('time_now_ms') or 0)
+    
+    # Sync requests already waiting in outgoing are not queued again
+    queued = {
+        (r[0], r[1]) for r in cur.execute(
+            "SELECT recipient, data FROM outgoing WHERE sent = 0"
+        ).fetchall()
+    }
     
     # From each identity, send sync request to peers known by that identity
+    outgoing_rows = []
+    seen = set()
     for identity_obj in identities:
         identity_pubkey = identity_obj.get('pubkey')
         if not identity_pubkey:
             continue
         
-        # Find peers known by this specific identity
-        known_peers = [p for p in peers if p.get('received_by') == identity_pubkey]
-            
-        for peer in known_peers:
-            peer_pubkey = peer.get('pubkey')
-            if not peer_pubkey:
+        # Every request from this identity carries the same sync_peers event
+        sync_event_json = json.dumps({"type": "sync_peers", "sender": identity_pubkey})
+        
+        # Peers known by this specific identity, excluding self and any
+        # (identity, peer) pair already queued in this batch
+        for peer_pubkey in peers_by_identity.get(identity_pubkey, ()):
+            if not peer_pubkey or peer_pubkey == identity_pubkey:
+                continue
+            key = (identity_pubkey, peer_pubkey)
+            if key in seen:
                 continue
-            
-            # Don't send to self
-            if identity_pubkey == peer_pubkey:
+            seen.add(key)
+            if (peer_pubkey, sync_event_json) in queued:
                 continue
-            
-            # Create sync_peers event
-            sync_event = {
-                "type": "sync_peers",
-                "sender": identity_pubkey
-            }
-            
-            # Create outgoing envelope
-            outgoing = {
-                "recipient": peer_pubkey,
-                "data": sync_event
-            }
-            
-            # Persist to SQL outgoing if available
-            try:
-                if hasattr(db, 'conn'):
-                    import json
-                    cur = db.conn.cursor()
-                    cur.execute(
-                        "INSERT INTO outgoing(recipient, data, created_at, sent) VALUES(?, ?, ?, 0)",
-                        (peer_pubkey, json.dumps(sync_event), int(input_data.get('time_now_ms') or 0))
-                    )
-                    db.conn.commit()
-            except Exception:
-                pass
-            sent_count += 1
+            outgoing_rows.append((peer_pubkey, sync_event_json, created_at))
+    
+    # Persist all outgoing sync requests in one batch
+    try:
+        cur.executemany(
+            "INSERT INTO outgoing(recipient, data, created_at, sent) VALUES(?, ?, ?, 0)",
+            outgoing_rows
+        )
+        db.conn.commit()
+    except Exception:
+        pass
     
-    # Count unique recipients
-    rows = cur.execute("SELECT DISTINCT recipient FROM outgoing WHERE sent = 0").fetchall()
-    unique_recipients = len(rows)
+    # Count unique recipients from the pairs queued above (no outgoing rescan)
+    unique_recipients = len({peer_pubkey for _, peer_pubkey in seen})
     
     return {
         "return": f"Sent sync requests from {len(identities)} identities to {unique_recipients} peers"
@@ -6,43 +6,49 @@ def execute(input_data, db):
     current_time_ms = input_data.get('time_now_ms', 0)
 
     # SQL outgoing
-    outgoing_rows = []
     if hasattr(db, 'conn'):
         try:
             import json
+            dumps = json.dumps
+            received_at = int(current_time_ms or 0)
             cur = db.conn.cursor()
-            rows = cur.execute("SELECT id, recipient, data FROM outgoing WHERE sent = 0 ORDER BY id").fetchall()
-            for r in rows:
-                oid = r[0]
-                recipient = r[1]
-                data = r[2]
-                if isinstance(data, bytes):
-                    data = data.decode('utf-8')
-                try:
-                    data_obj = json.loads(data) if isinstance(data, str) else data
-                except Exception:
-                    data_obj = data
-                outgoing_rows.append({"id": oid, "recipient": recipient, "data": data_obj})
+            rows = db.conn.execute("SELECT id, recipient, data FROM outgoing WHERE sent = 0 ORDER BY id")
 
-            # Insert into incoming table
-            for row in outgoing_rows:
-                env = {
-                    "origin": "network",
-                    "receivedAt": current_time_ms,
-                    "selfGenerated": False,
-                    "received_by": row["recipient"]
-                }
-                cur.execute(
-                    "INSERT INTO incoming(recipient, data, metadata, received_at) VALUES(?, ?, ?, ?)",
-                    (row["recipient"], json.dumps(row["data"]), json.dumps(env), int(current_time_ms or 0))
-                )
-                delivered_count += 1
+            # Stream outgoing rows straight into incoming rows; the stored
+            # data is already JSON text, so it is passed through rather than
+            # decoded into an intermediate envelope and re-encoded
+            last_id = None
+            # Only received_by varies per delivered row
+            base_metadata = {
+                "origin": "network",
+                "receivedAt": current_time_ms,
+                "selfGenerated": False,
+            }
 
-            # Delete delivered outgoing
-            if outgoing_rows:
-                ids = [r['id'] for r in outgoing_rows]
-                q_marks = ','.join(['?'] * len(ids))
-                cur.execute(f"DELETE FROM outgoing WHERE id IN ({q_marks})", ids)
+            def incoming_rows():
+                nonlocal last_id
+                for oid, recipient, data in rows:
+                    if isinstance(data, bytes):
+                        data = data.decode('utf-8')
+                    last_id = oid
+                    yield (
+                        recipient,
+                        data if isinstance(data, str) else dumps(data),
+                        dumps({**base_metadata, "received_by": recipient}),
+                        received_at,
+                    )
+
+            # Insert into incoming table in one batch
+            cur.executemany(
+                "INSERT INTO incoming(recipient, data, metadata, received_at) VALUES(?, ?, ?, ?)",
+                incoming_rows()
+            )
+            delivered_count = max(0, cur.rowcount)
+
+            # Drain what was delivered: rows were read in id order under the
+            # write lock, so everything unsent up to the last id went out
+            if last_id is not None:
+                cur.execute("DELETE FROM outgoing WHERE sent = 0 AND id <= ?", (last_id,))
             db.conn.commit()
         except Exception:
             pass
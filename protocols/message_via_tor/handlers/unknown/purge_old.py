@@ -20,14 +20,12 @@ def execute(input_data, db):
             # Count before
             before = cur.execute("SELECT COUNT(1) AS c FROM unknown_events").fetchone()
             before_count = before[0] if before else 0
-            # Delete old
-            cur.execute("DELETE FROM unknown_events WHERE timestamp <= ?", (int(cutoff_time),))
-            # Count after
-            after = cur.execute("SELECT COUNT(1) AS c FROM unknown_events").fetchone()
-            after_count = after[0] if after else 0
+            # Delete old; idx_unknown_timestamp turns the cutoff into a range
+            # seek, and rowcount avoids a second full COUNT afterwards
+            deleted = cur.execute("DELETE FROM unknown_events WHERE timestamp <= ?", (int(cutoff_time),))
             db.conn.commit()
-            purged_count = max(0, before_count - after_count)
-            remaining = after_count
+            purged_count = max(0, deleted.rowcount or 0)
+            remaining = max(0, before_count - purged_count)
         except Exception:
             purged_count = 0
             remaining = 0
@@ -1,39 +1,104 @@
 import json
 import uuid
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _dumps(obj):
+    """Compact JSON text; uses orjson when installed, stdlib json otherwise."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj).decode('utf-8')
+        except TypeError:
+            # e.g. non-str keys or oversized ints, which stdlib json accepts
+            pass
+    return json.dumps(obj, separators=(',', ':'))
+
+
+_INSERT_EVENT_PREFIX = (
+    "INSERT OR IGNORE INTO event_store(event_id, event_type, data, metadata, created_at_ms) "
+    "VALUES "
+)
+_ROW_VALUES = "(?, ?, ?, ?, ?)"
+_INSERT_EVENT = _INSERT_EVENT_PREFIX + _ROW_VALUES
+
+# Rows per multi-row INSERT; 50 x 5 parameters stays well under SQLite's
+# bound-parameter limit.
+APPEND_BATCH_ROWS = 50
+
+# Row count -> multi-row INSERT text, so each statement size is built once
+_insert_sql_by_rows = {1: _INSERT_EVENT}
+
+def _insert_sql(n):
+    sql = _insert_sql_by_rows.get(n)
+    if sql is None:
+        sql = _insert_sql_by_rows[n] = _INSERT_EVENT_PREFIX + ",".join([_ROW_VALUES] * n)
+    return sql
+
 def _ensure_event_id(metadata, data):
-    if isinstance(metadata, dict) and metadata.get('eventId'):
-        return str(metadata['eventId'])
-    if isinstance(data, dict) and data.get('id'):
-        return str(data['id'])
+    # EAFP: the id is nearly always present, so skip type checks on that path
+    try:
+        event_id = metadata['eventId']
+    except (TypeError, KeyError):
+        event_id = None
+    if not event_id:
+        try:
+            event_id = data['id']
+        except (TypeError, KeyError):
+            event_id = None
+    if event_id:
+        return str(event_id)
     return str(uuid.uuid4())
 
+def _event_row(envelope, created_at_ms):
+    data = envelope.get('data') or {}
+    metadata = envelope.get('metadata') or {}
+    return (
+        _ensure_event_id(metadata, data),
+        data.get('type') or 'unknown',
+        _dumps(data),
+        _dumps(metadata),
+        created_at_ms,
+    )
+
 def append(db, envelope, time_now_ms):
     """
     Append an event envelope to the SQL event_store for signed_groups.
+    Does not commit; runs inside the caller's transaction.
     """
-    if not hasattr(db, 'conn') or db.conn is None:
-        return
-    data = envelope.get('data') or {}
-    metadata = envelope.get('metadata') or {}
-    event_type = data.get('type') or 'unknown'
-    event_id = _ensure_event_id(metadata, data)
     try:
-        cur = db.conn.cursor()
-        cur.execute(
-            """
-            INSERT OR IGNORE INTO event_store(event_id, event_type, data, metadata, created_at_ms)
-            VALUES(?, ?, ?, ?, ?)
-            """,
-            (
-                event_id,
-                event_type,
-                json.dumps(data, sort_keys=True),
-                json.dumps(metadata, sort_keys=True),
-                int(time_now_ms or 0),
-            )
-        )
-        db.conn.commit()
+        db.cursor().execute(_INSERT_EVENT, _event_row(envelope, int(time_now_ms or 0)))
     except Exception:
         pass
 
+def append_many(db, envelopes, time_now_ms):
+    """
+    Append several envelopes as multi-row INSERTs of up to APPEND_BATCH_ROWS
+    rows each, so a batch costs one statement per chunk rather than per row.
+    Does not commit; runs inside the caller's transaction.
+    """
+    created_at_ms = int(time_now_ms or 0)
+    try:
+        cur = db.cursor()
+        rows = [_event_row(e, created_at_ms) for e in envelopes]
+    except Exception:
+        # An envelope that cannot be encoded: store the rest one by one
+        for envelope in envelopes:
+            append(db, envelope, time_now_ms)
+        return
+    for start in range(0, len(rows), APPEND_BATCH_ROWS):
+        chunk = rows[start:start + APPEND_BATCH_ROWS]
+        try:
+            cur.execute(_insert_sql(len(chunk)), [value for row in chunk for value in row])
+        except Exception:
+            # e.g. an unbindable value: retry the chunk row by row so one bad
+            # event does not drop its neighbours
+            for row in chunk:
+                try:
+                    cur.execute(_INSERT_EVENT, row)
+                except Exception:
+                    pass
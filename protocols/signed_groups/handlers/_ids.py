@@ -0,0 +1,9 @@
+import hashlib
+
+
+def hex_prefix(text, n_bytes):
+    """
+    Hex of the first `n_bytes` of sha256(text); same as hexdigest()[:2 * n_bytes].
+    Shared by the signed_groups commands that derive dummy ids and signatures.
+    """
+    return hashlib.sha256(text.encode()).digest()[:n_bytes].hex()
@@ -0,0 +1,121 @@
+_SELECT_USER = "SELECT 1 FROM users WHERE id = ? LIMIT 1"
+
+
+def _memo_set(db, key):
+    """The memoized set under `key` in db.lookup_cache, or None without a cache."""
+    cache = getattr(db, 'lookup_cache', None)
+    if cache is None:
+        return None
+    known = cache.get(key)
+    if known is None:
+        known = cache[key] = set()
+    return known
+
+
+def _memo_dict(db, key):
+    """The memoized dict under `key` in db.lookup_cache, or None without a cache."""
+    cache = getattr(db, 'lookup_cache', None)
+    if cache is None:
+        return None
+    known = cache.get(key)
+    if known is None:
+        known = cache[key] = {}
+    return known
+
+
+def user_exists(db, user_id):
+    """
+    Return True if the users table has `user_id`.
+
+    Users are never deleted, so hits are memoized in db.lookup_cache for the
+    life of the connection; misses are re-queried since the user may be
+    projected later. The user projector also records each user it writes.
+    """
+    known = _memo_set(db, 'users')
+    if known is not None and user_id in known:
+        return True
+    if db.cursor().execute(_SELECT_USER, (user_id,)).fetchone() is None:
+        return False
+    if known is not None:
+        known.add(user_id)
+    return True
+
+
+def remember_user(db, user_id):
+    """Record a user just written so user_exists answers it from memory."""
+    known = _memo_set(db, 'users')
+    if known is not None:
+        known.add(user_id)
+
+
+_SELECT_IDENTITY = "SELECT name FROM identities WHERE pubkey = ?"
+
+
+def identity_name_row(db, pubkey):
+    """
+    Return the `(name,)` row for identity `pubkey`, or None if unknown.
+
+    Identities are written with INSERT OR IGNORE and never updated, so hits
+    are memoized by pubkey in db.lookup_cache like user_exists.
+    """
+    known = _memo_dict(db, 'identities')
+    if known is not None:
+        row = known.get(pubkey)
+        if row is not None:
+            return row
+    row = db.cursor().execute(_SELECT_IDENTITY, (pubkey,)).fetchone()
+    if row is not None and known is not None:
+        known[pubkey] = row = tuple(row)
+    return row
+
+
+# Served entirely by idx_links_peer_user
+_SELECT_LINKED = "SELECT 1 FROM links WHERE peer_id = ? AND user_id = ? LIMIT 1"
+
+
+def peer_linked(db, peer_id, user_id):
+    """
+    Return True if a link joins `peer_id` to `user_id`.
+
+    Links are never deleted, so hits are memoized as (peer_id, user_id)
+    pairs; the link projector also records each link it writes.
+    """
+    pairs = _memo_set(db, 'links')
+    if pairs is not None and (peer_id, user_id) in pairs:
+        return True
+    if db.cursor().execute(_SELECT_LINKED, (peer_id, user_id)).fetchone() is None:
+        return False
+    if pairs is not None:
+        pairs.add((peer_id, user_id))
+    return True
+
+
+def remember_link(db, peer_id, user_id):
+    """Record a link just written so peer_linked answers it from memory."""
+    pairs = _memo_set(db, 'links')
+    if pairs is not None:
+        pairs.add((peer_id, user_id))
+
+
+def settled_network(db, network_id):
+    """
+    Return the memoized (creator_pubkey, first_group_id) of a network whose
+    first group is already fixed, or None when it must be read from SQL.
+    """
+    known = _memo_dict(db, 'networks')
+    return known.get(network_id) if known is not None else None
+
+
+def remember_network(db, network_id, creator_pubkey, first_group_id):
+    """
+    Memoize a network's creator and first group once both are known.
+
+    The creator never changes and first_group_id is only ever set while it
+    is NULL, so a network with both columns filled is safe to serve from
+    memory; one still missing its first group is left to SQL.
+    """
+    if not (creator_pubkey and first_group_id):
+        return
+    known = _memo_dict(db, 'networks')
+    if known is not None:
+        known[network_id] = (creator_pubkey, first_group_id)
@@ -0,0 +1,23 @@
+_INSERT_RECHECK = "INSERT OR IGNORE INTO recheck_queue(event_id) VALUES(?)"
+
+
+def unblock(db, event_id):
+    """
+    Enqueue a recheck marker for events blocked on this dependency (SQLite table).
+    Shared by every signed_groups projector that can satisfy a dependency.
+    Does not commit; the marker lands with the projector's own write.
+    """
+    try:
+        db.cursor().execute(_INSERT_RECHECK, (event_id,))
+    except Exception:
+        pass
+
+def unblock_many(db, event_ids):
+    """
+    Enqueue recheck markers for several satisfied dependencies with one
+    executemany. Does not commit, like unblock().
+    """
+    try:
+        db.cursor().executemany(_INSERT_RECHECK, [(event_id,) for event_id in event_ids])
+    except Exception:
+        pass
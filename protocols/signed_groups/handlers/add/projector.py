@@ -1,53 +1,55 @@
+from protocols.signed_groups.handlers._event_store import append as _append_event
+from protocols.signed_groups.handlers._unblock import unblock
+
+# Signature marker for events signed by a non-member (dummy crypto)
+_UNKNOWN_SIGNER = "dummy_sig_from_unknown"
+
+# Validate and insert in one statement: the group, the user and the adder
+# must all exist for the row to be written
+_INSERT_ADD = (
+    "INSERT OR IGNORE INTO adds(id, group_id, user_id, added_by, created_at_ms) "
+    "SELECT ?, ?, ?, ?, ? "
+    "WHERE EXISTS (SELECT 1 FROM groups WHERE id = ?) "
+    "AND EXISTS (SELECT 1 FROM users WHERE id = ?) "
+    "AND EXISTS (SELECT 1 FROM users WHERE id = ?)"
+)
+
+
 def project(db, envelope, time_now_ms):
     """
     Project add events into SQL (dict-state deprecated). Minimal SQL validation.
     """
     data = envelope.get('data', {})
-    if data.get('type') != 'add':
+    get = data.get
+    if get('type') != 'add':
         return db
 
-    add_id = data.get('id')
-    group_id = data.get('group_id')
-    user_id = data.get('user_id')
-    added_by = data.get('added_by')
-    signature = data.get('signature')
-    if not all([add_id, group_id, user_id, added_by, signature]):
+    add_id = get('id')
+    group_id = get('group_id')
+    user_id = get('user_id')
+    added_by = get('added_by')
+    signature = get('signature')
+    if not (add_id and group_id and user_id and added_by and signature):
         return db
 
     # Append to SQL event_store (protocol-owned)
-    try:
-        from .._event_store import append as _append_event
-        _append_event(db, envelope, time_now_ms)
-    except Exception:
-        pass
+    _append_event(db, envelope, time_now_ms)
 
-    # Minimal validation via SQL only
-    try:
-        cur = db.conn.cursor()
-        if signature.startswith("dummy_sig_from_unknown"):
-            return db
-        g = cur.execute("SELECT 1 FROM groups WHERE id = ? LIMIT 1", (group_id,)).fetchone()
-        u1 = cur.execute("SELECT 1 FROM users WHERE id = ? LIMIT 1", (user_id,)).fetchone()
-        u2 = cur.execute("SELECT 1 FROM users WHERE id = ? LIMIT 1", (added_by,)).fetchone()
-    except Exception:
-        return db
-    if not (g and u1 and u2):
+    # Unknown signer check (dummy)
+    if not isinstance(signature, str) or signature.startswith(_UNKNOWN_SIGNER):
         return db
 
-    # Persist to SQL
+    # Validate and persist to SQL
     try:
-        if hasattr(db, 'conn'):
-            cur = db.conn.cursor()
-            cur.execute(
-                """
-                INSERT OR IGNORE INTO adds(id, group_id, user_id, added_by, created_at_ms)
-                VALUES(?, ?, ?, ?, ?)
-                """,
-                (add_id, group_id, user_id, added_by, int(time_now_ms or 0))
-            )
-            db.conn.commit()
+        inserted = db.cursor().execute(
+            _INSERT_ADD,
+            (add_id, group_id, user_id, added_by, int(time_now_ms or 0), group_id, user_id, added_by)
+        ).rowcount
     except Exception:
-        pass
+        return db
+    if not inserted:
+        # Missing dependency or duplicate
+        return db
 
     try:
         unblock(db, add_id)
@@ -55,19 +57,3 @@ def project(db, envelope, time_now_ms):
         pass
 
     return db
-
-def unblock(db, event_id):
-    """
-    Enqueue recheck markers for events blocked on this dependency (SQLite table).
-    """
-    cursor = getattr(db, 'conn', None).cursor() if hasattr(db, 'conn') else None
-    # Dict-state deprecated; without a blocked index, no-op unless SQL mapping exists
-    if cursor is not None:
-        try:
-            cursor.execute(
-                "INSERT OR IGNORE INTO recheck_queue(event_id, reason_type, available_at_ms) VALUES(?, ?, ?)",
-                (event_id, None, 0)
-            )
-            db.conn.commit()
-        except Exception:
-            pass
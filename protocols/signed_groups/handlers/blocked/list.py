@@ -1,10 +1,13 @@
+_SELECT_MARKERS = "SELECT event_id, reason_type FROM recheck_queue ORDER BY available_at_ms"
+
+
 def execute(params, db):
     """
     Lists blocked/recheck markers from SQL (dict-state deprecated).
     """
-    blocked = []
-    cur = db.conn.cursor()
-    rows = cur.execute("SELECT event_id, reason_type FROM recheck_queue ORDER BY available_at_ms").fetchall()
-    for r in rows:
-        blocked.append({'event_id': r[0], 'blocked_by': None, 'reason': r[1]})
+    rows = db.cursor().execute(_SELECT_MARKERS)
+    blocked = [
+        {'event_id': event_id, 'blocked_by': None, 'reason': reason_type}
+        for event_id, reason_type in rows
+    ]
     return {'api_response': {'blocked': blocked}}
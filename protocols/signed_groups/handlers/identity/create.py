@@ -1,14 +1,17 @@
+import random
+import string
+
+# Alphabet for dummy key suffixes
+_KEY_ALPHABET = string.ascii_letters + string.digits
+
 def execute(params, db):
     """
     Creates an identity with dummy keypair
     """
-    import random
-    import string
-    
     name = params.get('name', 'Anonymous')
     
     # Generate dummy keys for testing
-    random_suffix = ''.join(random.choices(string.ascii_letters + string.digits, k=8))
+    random_suffix = ''.join(random.choices(_KEY_ALPHABET, k=8))
     pubkey = f"dummy_pub_{random_suffix}"
     privkey = f"dummy_priv_{random_suffix}"
     
@@ -1,36 +1,32 @@
+from protocols.signed_groups.handlers._event_store import append as _append_event
+
+_INSERT_IDENTITY = (
+    "INSERT OR IGNORE INTO identities(pubkey, privkey, name, created_at_ms) "
+    "VALUES(?, ?, ?, ?)"
+)
+
+
 def project(db, envelope, time_now_ms):
     """
     Project identity events to SQL (dict-state deprecated).
     """
     data = envelope.get('data', {})
-    if data.get('type') != 'identity':
+    get = data.get
+    if get('type') != 'identity':
         return db
 
-    pubkey = data.get('pubkey')
-    privkey = data.get('privkey')
-    name = data.get('name') or (pubkey[:8] if pubkey else None)
+    pubkey = get('pubkey')
+    privkey = get('privkey')
     if not pubkey or not privkey:
         return db
+    name = get('name') or pubkey[:8]
 
     # Append to SQL event_store (protocol-owned)
-    try:
-        from .._event_store import append as _append_event
-        _append_event(db, envelope, time_now_ms)
-    except Exception:
-        pass
+    _append_event(db, envelope, time_now_ms)
 
     # Persist to SQL
     try:
-        if hasattr(db, 'conn'):
-            cur = db.conn.cursor()
-            cur.execute(
-                """
-                INSERT OR IGNORE INTO identities(pubkey, privkey, name, created_at_ms)
-                VALUES(?, ?, ?, ?)
-                """,
-                (pubkey, privkey, name, int(time_now_ms or 0))
-            )
-            db.conn.commit()
+        db.cursor().execute(_INSERT_IDENTITY, (pubkey, privkey, name, int(time_now_ms or 0)))
     except Exception:
         pass
 
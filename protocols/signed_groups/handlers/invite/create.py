@@ -1,6 +1,34 @@
-import hashlib
 import json
 import base64
+import time
+from protocols.signed_groups.handlers._ids import hex_prefix
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# The earliest group is only read when the network has no first group yet:
+# COALESCE evaluates its arguments lazily
+_SELECT_INVITER = """
+    SELECT i.name AS identity_name, u.id AS user_id,
+           n.id AS network_id, n.name AS network_name,
+           n.first_group_id AS stored_first_group_id,
+           COALESCE(n.first_group_id,
+                    (SELECT id FROM groups ORDER BY created_at_ms LIMIT 1)) AS first_group_id
+    FROM identities i
+    LEFT JOIN users u ON u.pubkey = i.pubkey
+    LEFT JOIN networks n ON n.id = u.network_id
+    WHERE i.pubkey = ?
+    LIMIT 1
+"""
+
+def _json_bytes(obj):
+    """Compact UTF-8 JSON; uses orjson when installed, stdlib json otherwise."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode()
 
 def execute(params, db):
     """
@@ -15,52 +43,44 @@ def execute(params, db):
     if not hasattr(db, 'conn'):
         raise ValueError("Persistent DB required")
     cur = db.conn.cursor()
-    # Identity
-    row = cur.execute("SELECT name FROM identities WHERE pubkey = ?", (identity_id,)).fetchone()
-    identity_name = row[0] if row else None
+    # Identity, its user and that user's network in one keyed lookup: the
+    # identities primary key, idx_users_pubkey and the networks primary key.
+    # LEFT JOINs keep the separate "not found" errors below.
+    # Columns are read by name (rows are sqlite3.Row)
+    row = cur.execute(_SELECT_INVITER, (identity_id,)).fetchone()
+    identity_name = row['identity_name'] if row else None
     if not identity_name:
         raise ValueError(f"Identity {identity_id} not found")
     # User for identity
-    urow = cur.execute("SELECT id, network_id FROM users WHERE pubkey = ?", (identity_id,)).fetchone()
-    
-    if not urow:
+    user_id = row['user_id']
+    if not user_id:
         raise ValueError(f"User for identity {identity_id} not found")
-    user_id = urow[0] if not isinstance(urow, dict) else urow.get('id')
-    network_id = urow[1] if not isinstance(urow, dict) else urow.get('network_id')
     # Network
-    nrow = cur.execute("SELECT id, name FROM networks WHERE id = ?", (network_id,)).fetchone()
-    if not nrow:
+    if not row['network_id']:
         raise ValueError("No network found")
-    network = {'id': nrow[0] if not isinstance(nrow, dict) else nrow.get('id'), 'name': nrow[1] if not isinstance(nrow, dict) else nrow.get('name')}
-    # Determine first group id from networks table when available; otherwise derive and store
-    nrow2 = cur.execute("SELECT first_group_id FROM networks WHERE id = ?", (network['id'],)).fetchone()
-    first_group_id = None
-    if nrow2 and (nrow2[0] if not isinstance(nrow2, dict) else nrow2.get('first_group_id')):
-        first_group_id = nrow2[0] if not isinstance(nrow2, dict) else nrow2.get('first_group_id')
+    network = {'id': row['network_id'], 'name': row['network_name']}
+    # Use the network's first group id when set; otherwise the earliest group
+    first_group_id = row['first_group_id']
     if not first_group_id:
-        # Fallback: pick any existing group (earliest if created_at_ms available)
-        grow = cur.execute("SELECT id FROM groups ORDER BY created_at_ms LIMIT 1").fetchone()
-        if not grow:
-            raise ValueError("No groups found - at least one group is required")
-        first_group_id = grow[0] if not isinstance(grow, dict) else grow.get('id')
-        # Persist first_group_id for this network for future enforcement
+        raise ValueError("No groups found - at least one group is required")
+    if not row['stored_first_group_id']:
+        # Persist first_group_id for this network for future enforcement;
+        # commits with the command's transaction
         try:
             cur.execute("UPDATE networks SET first_group_id = ? WHERE id = ?", (first_group_id, network['id']))
-            db.conn.commit()
         except Exception:
             pass
     
     # Generate invite secret and derive public key
-    import time
     time_ms = int(time.time() * 1000)
     secret_data = f"{user_id}:{time_ms}"
-    invite_secret = "invite_secret_" + hashlib.sha256(secret_data.encode()).hexdigest()[:16]
-    invite_pubkey = "invite_pub_" + hashlib.sha256(invite_secret.encode()).hexdigest()[:16]
-    invite_id = hashlib.sha256(invite_pubkey.encode()).hexdigest()[:16]
+    invite_secret = "invite_secret_" + hex_prefix(secret_data, 8)
+    invite_pubkey = "invite_pub_" + hex_prefix(invite_secret, 8)
+    invite_id = hex_prefix(invite_pubkey, 8)
     
     # Create dummy signature
     signature_data = f"invite:{invite_id}:{user_id}"
-    signature = "dummy_sig_" + hashlib.sha256(signature_data.encode()).hexdigest()[:8]
+    signature = "dummy_sig_" + hex_prefix(signature_data, 4)
     
     # Create invite event
     invite_event = {
@@ -82,8 +102,7 @@ def execute(params, db):
     }
     
     # Encode invite link
-    invite_json = json.dumps(invite_data)
-    invite_b64 = base64.b64encode(invite_json.encode()).decode()
+    invite_b64 = base64.b64encode(_json_bytes(invite_data)).decode('ascii')
     invite_link = f"signed-groups://invite/{invite_b64}"
     
     return {
@@ -1,79 +1,96 @@
+from protocols.signed_groups.handlers._event_store import append_many as _append_events
+from protocols.signed_groups.handlers._lookups import remember_link
+from protocols.signed_groups.handlers._unblock import unblock_many
+
+# Signature marker naming the signing user (dummy crypto)
+_SIGNED_BY = "dummy_sig_signed_by_"
+_SIGNED_BY_LEN = len(_SIGNED_BY)
+
+# Validate and insert in one statement: the link invite must exist and
+# belong to the linked user for the row to be written
+_INSERT_LINK = (
+    "INSERT OR IGNORE INTO links(id, peer_id, user_id, link_invite_id, created_at_ms) "
+    "SELECT ?, ?, ?, ?, ? "
+    "WHERE EXISTS (SELECT 1 FROM link_invites WHERE id = ? AND user_id = ?)"
+)
+
+
 def project(db, envelope, time_now_ms):
     """
     Project link events into SQL (dict-state deprecated).
     """
-    data = envelope.get('data', {})
-    if data.get('type') != 'link':
-        return db
+    return project_batch(db, [envelope], time_now_ms)
 
-    link_id = data.get('id')
-    peer_id = data.get('peer_id')
-    user_id = data.get('user_id')
-    link_invite_id = data.get('link_invite_id')
-    link_invite_signature = data.get('link_invite_signature')
-    signature = data.get('signature')
-    if not all([link_id, peer_id, user_id, link_invite_id, link_invite_signature, signature]):
+
+def project_batch(db, envelopes, time_now_ms):
+    """
+    Project a run of link envelopes in order. The cursor is bound once, the
+    run is appended to the event_store in one go and recheck markers for
+    every new link are queued with one executemany.
+    """
+    try:
+        cur = db.cursor()
+    except AttributeError:
         return db
+    # Ids of satisfied dependencies; a set, as a peer may link repeatedly
+    satisfied = set()
+    stored = []
+    for envelope in envelopes:
+        _project_one(db, cur, envelope, time_now_ms, satisfied, stored)
 
     # Append to SQL event_store (protocol-owned)
-    try:
-        from .._event_store import append as _append_event
-        _append_event(db, envelope, time_now_ms)
-    except Exception:
-        pass
+    if stored:
+        _append_events(db, stored, time_now_ms)
 
-    if hasattr(db, 'conn'):
+    if satisfied:
         try:
-            cur = db.conn.cursor()
-            # Signature must be from peer
-            if signature.startswith("dummy_sig_signed_by_"):
-                signer_id = signature.replace("dummy_sig_signed_by_", "")
-                if signer_id != peer_id:
-                    return db
-            # Ensure link_invite exists and matches user
-            li = cur.execute("SELECT user_id FROM link_invites WHERE id = ?", (link_invite_id,)).fetchone()
-            if not li:
-                return db
-            if li[0] != user_id:
-                return db
+            unblock_many(db, satisfied)
         except Exception:
-            return db
-
-    # Persist to SQL
-    try:
-        if hasattr(db, 'conn'):
-            cur = db.conn.cursor()
-            cur.execute(
-                """
-                INSERT OR IGNORE INTO links(id, peer_id, user_id, link_invite_id, created_at_ms)
-                VALUES(?, ?, ?, ?, ?)
-                """,
-                (link_id, peer_id, user_id, link_invite_id, int(time_now_ms or 0))
-            )
-            db.conn.commit()
-    except Exception:
-        pass
-
-    try:
-        unblock(db, link_id)
-        unblock(db, peer_id)
-    except Exception:
-        pass
+            pass
 
     return db
 
-def unblock(db, event_id):
+
+def _project_one(db, cur, envelope, time_now_ms, satisfied, stored):
     """
-    Enqueue recheck markers for events blocked on this dependency (SQLite table).
+    Project one link envelope; ids it satisfies are added to `satisfied` and
+    a well-formed envelope to `stored` for the event_store.
     """
-    cursor = getattr(db, 'conn', None).cursor() if hasattr(db, 'conn') else None
-    
-    if cursor is not None:
-        try:
-            cursor.execute(
-                "INSERT OR IGNORE INTO recheck_queue(event_id, reason_type, available_at_ms) VALUES(?, ?, ?)",
-                (event_id, None, 0)
-            )
-            db.conn.commit()
-        except Exception:
-            pass
+    data = envelope.get('data', {})
+    get = data.get
+    if get('type') != 'link':
+        return
+
+    link_id = get('id')
+    peer_id = get('peer_id')
+    user_id = get('user_id')
+    link_invite_id = get('link_invite_id')
+    link_invite_signature = get('link_invite_signature')
+    signature = get('signature')
+    if not (link_id and peer_id and user_id and link_invite_id and link_invite_signature and signature):
+        return
+
+    stored.append(envelope)
+
+    # Signature must be from peer (dummy); a non-str signature is never valid
+    if not isinstance(signature, str):
+        return
+    if signature.startswith(_SIGNED_BY) and signature[_SIGNED_BY_LEN:] != peer_id:
+        return
+
+    # Validate and persist to SQL
+    try:
+        inserted = cur.execute(
+            _INSERT_LINK,
+            (link_id, peer_id, user_id, link_invite_id, int(time_now_ms or 0),
+             link_invite_id, user_id)
+        ).rowcount
+    except Exception:
+        return
+    if not inserted:
+        # Missing or mismatched link invite, or duplicate
+        return
+
+    remember_link(db, peer_id, user_id)
+    satisfied.add(link_id)
+    satisfied.add(peer_id)
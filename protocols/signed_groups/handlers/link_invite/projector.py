@@ -1,50 +1,54 @@
+from protocols.signed_groups.handlers._event_store import append as _append_event
+from protocols.signed_groups.handlers._lookups import user_exists
+from protocols.signed_groups.handlers._unblock import unblock
+
+# Signature marker for events signed by a non-member (dummy crypto)
+_UNKNOWN_SIGNER = "dummy_sig_from_unknown"
+
+
 def project(db, envelope, time_now_ms):
     """
     Project link-invite events into SQL (dict-state deprecated). Minimal SQL checks.
     """
     data = envelope.get('data', {})
-    if data.get('type') != 'link_invite':
+    get = data.get
+    if get('type') != 'link_invite':
         return db
 
-    link_invite_id = data.get('id')
-    link_invite_pubkey = data.get('link_invite_pubkey')
-    user_id = data.get('user_id')
-    signature = data.get('signature')
-    if not all([link_invite_id, link_invite_pubkey, user_id, signature]):
+    link_invite_id = get('id')
+    link_invite_pubkey = get('link_invite_pubkey')
+    user_id = get('user_id')
+    signature = get('signature')
+    if not (link_invite_id and link_invite_pubkey and user_id and signature):
         return db
 
     # Append to SQL event_store (protocol-owned)
-    try:
-        from .._event_store import append as _append_event
-        _append_event(db, envelope, time_now_ms)
-    except Exception:
-        pass
+    _append_event(db, envelope, time_now_ms)
 
     # Minimal validations via SQL only
     try:
-        if signature.startswith("dummy_sig_from_unknown"):
+        if signature.startswith(_UNKNOWN_SIGNER):
             return db
-        cur = db.conn.cursor()
-        u = cur.execute("SELECT 1 FROM users WHERE id = ? LIMIT 1", (user_id,)).fetchone()
-        if not u:
+        if not user_exists(db, user_id):
             return db
     except Exception:
         return db
 
     # Persist to SQL
     try:
-        if hasattr(db, 'conn'):
-            cur = db.conn.cursor()
-            cur.execute(
-                """
-                INSERT OR IGNORE INTO link_invites(id, link_invite_pubkey, user_id, created_at_ms)
-                VALUES(?, ?, ?, ?)
-                """,
-                (link_invite_id, link_invite_pubkey, user_id, int(time_now_ms or 0))
-            )
-            db.conn.commit()
+        cur = db.cursor()
+        inserted = cur.execute(
+            """
+            INSERT OR IGNORE INTO link_invites(id, link_invite_pubkey, user_id, created_at_ms)
+            VALUES(?, ?, ?, ?)
+            """,
+            (link_invite_id, link_invite_pubkey, user_id, int(time_now_ms or 0))
+        ).rowcount
     except Exception:
-        pass
+        return db
+    if not inserted:
+        # Duplicate: its rechecks were queued when it first projected
+        return db
 
     try:
         unblock(db, link_invite_id)
@@ -52,19 +56,3 @@ def project(db, envelope, time_now_ms):
         pass
 
     return db
-
-def unblock(db, event_id):
-    """
-    Enqueue recheck markers for events blocked on this dependency (SQLite table).
-    """
-    cursor = getattr(db, 'conn', None).cursor() if hasattr(db, 'conn') else None
-    
-    if cursor is not None:
-        try:
-            cursor.execute(
-                "INSERT OR IGNORE INTO recheck_queue(event_id, reason_type, available_at_ms) VALUES(?, ?, ?)",
-                (event_id, None, 0)
-            )
-            db.conn.commit()
-        except Exception:
-            pass
@@ -1,63 +1,94 @@
+from protocols.signed_groups.handlers._event_store import append_many as _append_events
+from protocols.signed_groups.handlers._lookups import peer_linked
+
+# Signature marker naming the signing user (dummy crypto)
+_SIGNED_BY = "dummy_sig_signed_by_"
+_SIGNED_BY_LEN = len(_SIGNED_BY)
+
+_INSERT_MESSAGE = (
+    "INSERT OR IGNORE INTO messages(id, channel_id, author_id, peer_id, user_id, content, created_at_ms) "
+    "VALUES(?, ?, ?, ?, ?, ?, ?)"
+)
+
+
 def project(db, envelope, time_now_ms):
     """
     Project message events to SQL (dict-state deprecated). Minimal validation.
     """
-    data = envelope.get('data', {})
-    if data.get('type') != 'message':
-        return db
+    return project_batch(db, [envelope], time_now_ms)
+
 
-    message_id = data.get('id')
-    channel_id = data.get('channel_id')
-    author_id = data.get('author_id')
-    peer_id = data.get('peer_id')
-    user_id = data.get('user_id')
-    content = data.get('content') or data.get('text')
-    signature = data.get('signature')
-    if not all([message_id, channel_id, author_id, content, signature, peer_id]):
+def project_batch(db, envelopes, time_now_ms):
+    """
+    Project a run of message envelopes in order. Valid rows are written with
+    one executemany at the end; messages never depend on each other, so
+    deferring their inserts changes no validation result. Does not commit;
+    the caller owns the transaction.
+    """
+    try:
+        cur = db.cursor()
+    except AttributeError:
         return db
+    stored = []
+    rows = []
+    for envelope in envelopes:
+        row = _validate(db, envelope, time_now_ms, stored)
+        if row is not None:
+            rows.append(row)
 
     # Append to SQL event_store (protocol-owned)
-    try:
-        from .._event_store import append as _append_event
-        _append_event(db, envelope, time_now_ms)
-    except Exception:
-        pass
+    if stored:
+        _append_events(db, stored, time_now_ms)
+
+    if rows:
+        try:
+            cur.executemany(_INSERT_MESSAGE, rows)
+        except Exception:
+            # e.g. an unbindable value: fall back to row by row so one bad
+            # message does not drop the rest of the run
+            for row in rows:
+                try:
+                    cur.execute(_INSERT_MESSAGE, row)
+                except Exception:
+                    pass
+
+    return db
+
+
+def _validate(db, envelope, time_now_ms, stored):
+    """
+    Validate one message envelope; returns its messages row, or None.
+    Well-formed envelopes are added to `stored` for the event_store.
+    """
+    data = envelope.get('data', {})
+    get = data.get
+    if get('type') != 'message':
+        return None
+
+    message_id = get('id')
+    channel_id = get('channel_id')
+    author_id = get('author_id')
+    peer_id = get('peer_id')
+    user_id = get('user_id')
+    content = get('content') or get('text')
+    signature = get('signature')
+    if not (message_id and channel_id and author_id and content and signature and peer_id):
+        return None
+
+    stored.append(envelope)
 
     # Minimal validations: signature must match peer_id; peer must be linked to user when different
     try:
         # Signature check
-        if signature.startswith("dummy_sig_signed_by_"):
-            signer = signature.replace("dummy_sig_signed_by_", "")
+        if signature.startswith(_SIGNED_BY):
+            signer = signature[_SIGNED_BY_LEN:]
             if signer != str(peer_id):
-                return db
+                return None
         # Link check (allow self-messages where peer_id == user_id)
-        if peer_id and user_id and peer_id != user_id:
-            try:
-                cur = db.conn.cursor()
-                row = cur.execute(
-                    "SELECT 1 FROM links WHERE peer_id = ? AND user_id = ? LIMIT 1",
-                    (peer_id, user_id)
-                ).fetchone()
-                if not row:
-                    return db
-            except Exception:
-                return db
-    except Exception:
-        return db
-
-    # Persist to SQL
-    try:
-        if hasattr(db, 'conn'):
-            cur = db.conn.cursor()
-            cur.execute(
-                """
-                INSERT OR IGNORE INTO messages(id, channel_id, author_id, peer_id, user_id, content, created_at_ms)
-                VALUES(?, ?, ?, ?, ?, ?, ?)
-                """,
-                (message_id, channel_id, author_id, peer_id, user_id, content, int(time_now_ms or 0))
-            )
-            db.conn.commit()
+        if user_id and peer_id != user_id:
+            if not peer_linked(db, peer_id, user_id):
+                return None
     except Exception:
-        pass
+        return None
 
-    return db
+    return (message_id, channel_id, author_id, peer_id, user_id, content, int(time_now_ms or 0))
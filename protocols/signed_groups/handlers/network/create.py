@@ -1,4 +1,4 @@
-import hashlib
+from protocols.signed_groups.handlers._ids import hex_prefix
 
 def execute(params, db):
     """
@@ -24,8 +24,7 @@ def execute(params, db):
         raise ValueError(f"Identity {identity_id} not found")
     
     # Generate network ID (hash of name + creator)
-    network_id_data = f"{name}:{identity_id}".encode()
-    network_id = hashlib.sha256(network_id_data).hexdigest()[:16]
+    network_id = hex_prefix(f"{name}:{identity_id}", 8)
     
     # Create network event (no signature needed - bootstrap event)
     network_event = {
@@ -36,9 +35,8 @@ def execute(params, db):
     }
     
     # Create user event for creator (automatically valid as network creator)
-    user_id = hashlib.sha256(f"{network_id}:{identity_id}".encode()).hexdigest()[:16]
-    user_signature_data = f"user:{user_id}"
-    user_signature = "dummy_sig_" + hashlib.sha256(user_signature_data.encode()).hexdigest()[:8]
+    user_id = hex_prefix(f"{network_id}:{identity_id}", 8)
+    user_signature = "dummy_sig_" + hex_prefix(f"user:{user_id}", 4)
     
     user_event = {
         'type': 'user',
@@ -1,37 +1,65 @@
+import sqlite3
+
+from protocols.signed_groups.handlers._event_store import append_many as _append_events
+
+_INSERT_NETWORK = (
+    "INSERT OR IGNORE INTO networks(id, name, creator_pubkey, created_at_ms) "
+    "VALUES(?, ?, ?, ?)"
+)
+
+
 def project(db, envelope, time_now_ms):
     """
     Project network events into SQL (dict-state deprecated).
     """
-    data = envelope.get('data', {})
-    if data.get('type') != 'network':
-        return db
+    return project_batch(db, [envelope], time_now_ms)
 
-    network_id = data.get('id')
-    name = data.get('name')
-    creator_pubkey = data.get('creator_pubkey')
-    if not network_id or not name or not creator_pubkey:
-        return db
 
-    # Append to SQL event_store (protocol-owned)
+def project_batch(db, envelopes, time_now_ms):
+    """
+    Project a run of network envelopes with one executemany. Only envelopes
+    whose row was written go to the event_store. Does not commit; the caller
+    owns the transaction.
+    """
     try:
-        from .._event_store import append as _append_event
-        _append_event(db, envelope, time_now_ms)
-    except Exception:
-        pass
+        cur = db.cursor()
+    except AttributeError:
+        return db
+    stored = []
+    rows = []
+    for envelope in envelopes:
+        data = envelope.get('data', {})
+        get = data.get
+        if get('type') != 'network':
+            continue
+
+        network_id = get('id')
+        name = get('name')
+        creator_pubkey = get('creator_pubkey')
+        if not network_id or not name or not creator_pubkey:
+            continue
+
+        stored.append(envelope)
+        rows.append((network_id, name, creator_pubkey, int(time_now_ms or 0)))
 
-    # Persist to SQL
+    if not rows:
+        return db
     try:
-        if hasattr(db, 'conn'):
-            cur = db.conn.cursor()
-            cur.execute(
-                """
-                INSERT OR IGNORE INTO networks(id, name, creator_pubkey, created_at_ms)
-                VALUES(?, ?, ?, ?)
-                """,
-                (network_id, name, creator_pubkey, int(time_now_ms or 0))
-            )
-            db.conn.commit()
-    except Exception:
-        pass
+        cur.executemany(_INSERT_NETWORK, rows)
+    except sqlite3.Error:
+        # e.g. an unbindable value: fall back to row by row so one bad
+        # network does not drop the rest of the run
+        written = []
+        for envelope, row in zip(stored, rows):
+            try:
+                cur.execute(_INSERT_NETWORK, row)
+            except sqlite3.Error:
+                continue
+            written.append(envelope)
+        stored = written
+
+    # Append to SQL event_store (protocol-owned)
+    if stored:
+        _append_events(db, stored, time_now_ms)
 
     return db
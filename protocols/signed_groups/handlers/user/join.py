@@ -1,6 +1,10 @@
 import json
 import base64
-import hashlib
+from protocols.signed_groups.handlers._ids import hex_prefix
+from protocols.signed_groups.handlers._lookups import identity_name_row
+
+# Indexed by idx_invites_pubkey
+_SQL_GET_INVITE = "SELECT id, network_id, group_id FROM invites WHERE invite_pubkey = ?"
 
 def execute(params, db):
     """
@@ -33,33 +37,26 @@ def execute(params, db):
     # Find identity via SQL
     if not hasattr(db, 'conn'):
         raise ValueError("Persistent DB required")
-    cur = db.conn.cursor()
-    row = cur.execute("SELECT name FROM identities WHERE pubkey = ?", (identity_id,)).fetchone()
+    row = identity_name_row(db, identity_id)
     if not row:
         raise ValueError(f"Identity {identity_id} not found")
-    identity_name = row[0] if not isinstance(row, dict) else row.get('name')
+    identity_name = row[0]
     
     # Derive invite pubkey from secret
-    invite_pubkey = "invite_pub_" + hashlib.sha256(invite_secret.encode()).hexdigest()[:16]
+    invite_pubkey = "invite_pub_" + hex_prefix(invite_secret, 8)
     
     # Find matching invite via SQL
-    inv_row = cur.execute("SELECT id, network_id, group_id FROM invites WHERE invite_pubkey = ?", (invite_pubkey,)).fetchone()
+    inv_row = db.cursor().execute(_SQL_GET_INVITE, (invite_pubkey,)).fetchone()
     if not inv_row:
         raise ValueError("Invite not found or invalid")
-    invite = {
-        'id': inv_row[0] if not isinstance(inv_row, dict) else inv_row.get('id'),
-        'network_id': inv_row[1] if not isinstance(inv_row, dict) else inv_row.get('network_id'),
-        'group_id': inv_row[2] if not isinstance(inv_row, dict) else inv_row.get('group_id')
-    }
+    invite_id, invite_net, invite_grp = inv_row
     
     # Generate user ID
-    user_id = hashlib.sha256(f"{network_id}:{identity_id}:{invite['id']}".encode()).hexdigest()[:16]
+    user_id = hex_prefix(f"{network_id}:{identity_id}:{invite_id}", 8)
     
     # Create dummy signatures
-    inv_sig_data = f"{invite_secret}:{user_id}"
-    invite_signature = "dummy_inv_sig_" + hashlib.sha256(inv_sig_data.encode()).hexdigest()[:8]
-    sig_data = f"user:{user_id}:{identity_id}"
-    signature = "dummy_sig_" + hashlib.sha256(sig_data.encode()).hexdigest()[:8]
+    invite_signature = "dummy_inv_sig_" + hex_prefix(f"{invite_secret}:{user_id}", 4)
+    signature = "dummy_sig_" + hex_prefix(f"user:{user_id}:{identity_id}", 4)
     
     # Create user event
     user_event = {
@@ -69,7 +66,7 @@ def execute(params, db):
         'group_id': group_id,  # From invite
         'pubkey': identity_id,
         'name': identity_name,
-        'invite_id': invite['id'],
+        'invite_id': invite_id,
         'invite_signature': invite_signature,
         'signature': signature
     }
@@ -1,116 +1,134 @@
+import sqlite3
+
+from protocols.signed_groups.handlers._event_store import append_many as _append_events
+from protocols.signed_groups.handlers._lookups import remember_network, remember_user, settled_network
+from protocols.signed_groups.handlers._unblock import unblock_many
+
+# Signature marker for events signed by a non-member (dummy crypto)
+_UNKNOWN_SIGNER = "dummy_sig_from_unknown"
+
+# Network creator, first group and invite existence in one round trip; the
+# LEFT JOIN keeps a row when the network is not known yet
+_SELECT_NETWORK_AND_INVITE = (
+    "SELECT n.creator_pubkey, n.first_group_id, "
+    "EXISTS (SELECT 1 FROM invites WHERE id = ?) AS invite_exists "
+    "FROM (SELECT 1) LEFT JOIN networks n ON n.id = ?"
+)
+_SELECT_INVITE_EXISTS = "SELECT EXISTS (SELECT 1 FROM invites WHERE id = ?)"
+_SET_FIRST_GROUP = "UPDATE networks SET first_group_id = ? WHERE id = ?"
+_INSERT_USER = (
+    "INSERT OR IGNORE INTO users(id, network_id, pubkey, name, group_id, invite_id, created_at_ms) "
+    "VALUES(?, ?, ?, ?, ?, ?, ?)"
+)
+
+
 def project(db, envelope, time_now_ms):
     """
     Project user events into SQL (dict-state deprecated). Minimal SQL validation.
     """
-    data = envelope.get('data', {})
-    if data.get('type') != 'user':
-        return db
+    return project_batch(db, [envelope], time_now_ms)
 
-    user_id = data.get('id')
-    network_id = data.get('network_id')
-    pubkey = data.get('pubkey')
-    name = data.get('name')
-    invite_id = data.get('invite_id')
-    group_id = data.get('group_id')
-    signature = data.get('signature')
 
-    if not all([user_id, network_id, pubkey, name, signature]):
+def project_batch(db, envelopes, time_now_ms):
+    """
+    Project a run of user envelopes in order. Each user is validated and
+    written in turn, since a join can fix its network's first group for the
+    joins after it; the run is appended to the event_store in one go and
+    recheck markers for the new users are queued with one executemany. Does
+    not commit; the caller owns the transaction, so the user rows,
+    first-group updates and recheck markers land together.
+    """
+    try:
+        cur = db.cursor()
+    except AttributeError:
         return db
+    satisfied = []
+    stored = []
+    for envelope in envelopes:
+        _project_one(db, cur, envelope, time_now_ms, satisfied, stored)
 
     # Append to SQL event_store (protocol-owned)
-    try:
-        from .._event_store import append as _append_event
-        _append_event(db, envelope, time_now_ms)
-    except Exception:
-        pass
-
-    # Basic SQL validations
-    if hasattr(db, 'conn'):
-        try:
-            cur = db.conn.cursor()
-            # If signature unknown, allow only if network creator
-            if signature.startswith("dummy_sig_from_unknown"):
-                creator = cur.execute(
-                    "SELECT creator_pubkey FROM networks WHERE id = ? LIMIT 1",
-                    (network_id,)
-                ).fetchone()
-                if not creator or (creator[0] != pubkey):
-                    return db
-
-            if invite_id:
-                # group_id must be present when joining via invite
-                if not group_id:
-                    return db
-                # invite must exist
-                inv = cur.execute("SELECT 1 FROM invites WHERE id = ? LIMIT 1", (invite_id,)).fetchone()
-                if not inv:
-                    return db
-                # Enforce first-group rule when known
-                try:
-                    nrow = cur.execute("SELECT first_group_id FROM networks WHERE id = ? LIMIT 1", (network_id,)).fetchone()
-                    current_first = nrow[0] if nrow else None
-                    if current_first:
-                        if current_first != group_id:
-                            return db
-                    else:
-                        # If unknown, set it now based on this invite usage
-                        cur.execute("UPDATE networks SET first_group_id = ? WHERE id = ?", (group_id, network_id))
-                        db.conn.commit()
-                except Exception:
-                    pass
-            else:
-                # Not network creator and no invite: invalid
-                creator = cur.execute(
-                    "SELECT creator_pubkey FROM networks WHERE id = ? LIMIT 1",
-                    (network_id,)
-                ).fetchone()
-                if not creator or (creator[0] != pubkey):
-                    return db
-        except Exception:
-            return db
-
-    # Persist user
-    try:
-        if hasattr(db, 'conn'):
-            cur = db.conn.cursor()
-            cur.execute(
-                """
-                INSERT OR IGNORE INTO users(id, network_id, pubkey, name, group_id, invite_id, created_at_ms)
-                VALUES(?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    user_id,
-                    network_id,
-                    pubkey,
-                    name,
-                    group_id,
-                    invite_id,
-                    int(time_now_ms or 0)
-                )
-            )
-            db.conn.commit()
-    except Exception:
-        pass
+    if stored:
+        _append_events(db, stored, time_now_ms)
 
-    try:
-        unblock(db, user_id)
-    except Exception:
-        pass
+    if satisfied:
+        unblock_many(db, satisfied)
 
     return db
 
-def unblock(db, event_id):
+
+def _project_one(db, cur, envelope, time_now_ms, satisfied, stored):
     """
-    Enqueue recheck markers for events blocked on this dependency (SQLite table).
+    Project one user envelope; a newly written user id is added to
+    `satisfied` and a well-formed envelope to `stored` for the event_store.
     """
-    cursor = getattr(db, 'conn', None).cursor() if hasattr(db, 'conn') else None
-    # Without dict-state, enqueue this event for recheck if possible
-    if cursor is not None:
-        try:
-            cursor.execute(
-                "INSERT OR IGNORE INTO recheck_queue(event_id, reason_type, available_at_ms) VALUES(?, ?, ?)",
-                (event_id, None, 0)
-            )
-            db.conn.commit()
-        except Exception:
-            pass
+    data = envelope.get('data', {})
+    get = data.get
+    if get('type') != 'user':
+        return
+
+    user_id = get('id')
+    network_id = get('network_id')
+    pubkey = get('pubkey')
+    name = get('name')
+    invite_id = get('invite_id')
+    group_id = get('group_id')
+    signature = get('signature')
+
+    if not (user_id and network_id and pubkey and name and isinstance(signature, str) and signature):
+        return
+
+    stored.append(envelope)
+
+    # Basic SQL validations
+    try:
+        # A burst of joins to one network reads its row once; after that
+        # only the invite is checked
+        settled = settled_network(db, network_id)
+        if settled is not None:
+            creator_pubkey, first_group_id = settled
+            invite_exists = invite_id and cur.execute(_SELECT_INVITE_EXISTS, (invite_id,)).fetchone()[0]
+        else:
+            # Always one row; NULL network columns when the network is unknown.
+            # Columns are read by name (rows are sqlite3.Row)
+            row = cur.execute(_SELECT_NETWORK_AND_INVITE, (invite_id, network_id)).fetchone()
+            creator_pubkey = row['creator_pubkey']
+            first_group_id = row['first_group_id']
+            invite_exists = row['invite_exists']
+            remember_network(db, network_id, creator_pubkey, first_group_id)
+        # Without an invite, or with an unknown signer, only the network
+        # creator may join; the prefix is only tested for non-creators
+        if creator_pubkey != pubkey and (not invite_id or signature.startswith(_UNKNOWN_SIGNER)):
+            return
+
+        if invite_id:
+            # Joining via invite needs a group_id and an existing invite,
+            # and must use the network's first group once that is known
+            if not group_id or not invite_exists:
+                return
+            if first_group_id:
+                if first_group_id != group_id:
+                    return
+            else:
+                # If unknown, set it now based on this invite usage
+                try:
+                    if cur.execute(_SET_FIRST_GROUP, (group_id, network_id)).rowcount:
+                        remember_network(db, network_id, creator_pubkey, group_id)
+                except sqlite3.Error:
+                    pass
+    except (sqlite3.Error, TypeError):
+        # An id SQLite cannot bind, or one that cannot key the network memo
+        return
+
+    # Persist user; a duplicate writes nothing and satisfies nothing new
+    try:
+        inserted = cur.execute(
+            _INSERT_USER,
+            (user_id, network_id, pubkey, name, group_id, invite_id, int(time_now_ms or 0))
+        ).rowcount
+    except sqlite3.Error:
+        return
+    if not inserted:
+        return
+    remember_user(db, user_id)
+    satisfied.append(user_id)
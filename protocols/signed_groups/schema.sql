@@ -1,13 +1,14 @@
 -- signed_groups protocol schema
 
 -- Recheck marker queue for dependency-unblocking
+-- WITHOUT ROWID: rows are stored directly in the event_id key b-tree.
+-- No index on available_at_ms: markers are written on nearly every
+-- projection, while only blocked.list orders by it (sorted at read time).
 CREATE TABLE IF NOT EXISTS recheck_queue (
   event_id TEXT PRIMARY KEY,
   reason_type TEXT,
   available_at_ms INTEGER NOT NULL DEFAULT 0
-);
-
-CREATE INDEX IF NOT EXISTS idx_recheck_available ON recheck_queue (available_at_ms);
+) WITHOUT ROWID;
 
 -- Core domain tables (initial SQL migration)
 
@@ -46,7 +47,8 @@ CREATE TABLE IF NOT EXISTS groups (
   id TEXT PRIMARY KEY,
   name TEXT NOT NULL,
   created_by TEXT NOT NULL,
-  created_at_ms INTEGER NOT NULL
+  created_at_ms INTEGER NOT NULL,
+  INDEX idx_groups_created (created_at_ms)
 );
 
 -- Channels
@@ -62,6 +64,7 @@ CREATE TABLE IF NOT EXISTS channels (
 );
 
 -- Invites (for joining the network)
+-- Read by id (user projection) and by invite_pubkey (join) only
 CREATE TABLE IF NOT EXISTS invites (
   id TEXT PRIMARY KEY,
   invite_pubkey TEXT NOT NULL,
@@ -69,28 +72,28 @@ CREATE TABLE IF NOT EXISTS invites (
   group_id TEXT NOT NULL,
   created_by TEXT NOT NULL,
   created_at_ms INTEGER NOT NULL,
-  INDEX idx_invites_pubkey (invite_pubkey),
-  INDEX idx_invites_group (group_id)
+  INDEX idx_invites_pubkey (invite_pubkey)
 );
 
 -- Link invites (for linking devices to a user)
+-- Read by id only (link projection)
 CREATE TABLE IF NOT EXISTS link_invites (
   id TEXT PRIMARY KEY,
   link_invite_pubkey TEXT NOT NULL,
   user_id TEXT NOT NULL,
-  created_at_ms INTEGER NOT NULL,
-  INDEX idx_link_invites_user (user_id)
+  created_at_ms INTEGER NOT NULL
 );
 
 -- Links (device peer linked to user)
+-- Read by (peer_id, user_id) only (message projection); the composite
+-- index answers that probe without touching the table
 CREATE TABLE IF NOT EXISTS links (
   id TEXT PRIMARY KEY,
   peer_id TEXT NOT NULL,
   user_id TEXT NOT NULL,
   link_invite_id TEXT NOT NULL,
   created_at_ms INTEGER NOT NULL,
-  INDEX idx_links_user (user_id),
-  INDEX idx_links_peer (peer_id)
+  INDEX idx_links_peer_user (peer_id, user_id)
 );
 
 -- Adds (add user to group)
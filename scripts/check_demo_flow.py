@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Debug checks for the message_via_tor demo, run in-process.
+
+Replaces the old root-level test_demo_error.py, test_demo_flow.py and
+test_message_flow.py helpers: the demo startup check imports demo.py and
+builds the app instead of spawning (and pkill-ing) a subprocess, and the
+two API flows share one execute_api walk-through.
+
+Usage: python scripts/check_demo_flow.py [--skip-startup]
+"""
+import argparse
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+import traceback
+from pathlib import Path
+
+# Add the root directory to path for core imports and run API calls from it
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+os.chdir(project_root)
+
+from core.api import execute_api
+
+DEMO_PATH = project_root / "protocols" / "message_via_tor" / "demo" / "demo.py"
+
+
+def check_demo_startup():
+    """Import demo.py and construct the app, without starting its event loop."""
+    print("Checking demo startup...")
+    if importlib.util.find_spec("textual") is None:
+        print("   SKIPPED: textual is not installed")
+        return True
+    try:
+        spec = importlib.util.spec_from_file_location("demo", DEMO_PATH)
+        demo = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(demo)
+        demo.MessageViaTorDemo()
+    except Exception:
+        print("   ERROR: demo.py failed to start")
+        traceback.print_exc()
+        return False
+    finally:
+        # demo.py chdirs on import; keep API calls rooted at the project
+        os.chdir(project_root)
+    print("   OK")
+    return True
+
+
+def _call(label, method, path, data=None):
+    """Run one API call, printing the response; returns the body or None on error."""
+    print(f"\n{label}")
+    try:
+        response = execute_api("message_via_tor", method, path, data=data or {})
+    except Exception:
+        print("   ERROR:")
+        traceback.print_exc()
+        return None
+    print(f"   Response: {response}")
+    return response.get('body', {})
+
+
+def check_message_flow():
+    """Walk identities, invite, join, messaging and tick through the API."""
+    db_dir = tempfile.mkdtemp(prefix="check_demo_flow_")
+    os.environ['API_DB_PATH'] = os.path.join(db_dir, "check_demo_flow.db")
+    try:
+        return _message_flow()
+    finally:
+        shutil.rmtree(db_dir, ignore_errors=True)
+
+
+def _message_flow():
+    body = _call("1. Creating Alice identity...", "POST", "/identities", {"name": "Alice"})
+    if body is None:
+        return False
+    alice_id = body.get('identityId')
+
+    body = _call("2. Creating invite from Alice...", "POST", f"/identities/{alice_id}/invite")
+    if body is None:
+        return False
+    invite_link = body.get('inviteLink')
+
+    body = _call("3. Bob joining with invite...", "POST", "/join",
+                 {"name": "Bob", "inviteLink": invite_link})
+    if body is None:
+        return False
+    bob_id = body.get('identity', {}).get('pubkey')
+
+    if _call("4. Alice sending message...", "POST", "/messages",
+             {"text": "Hello Bob!", "senderId": alice_id}) is None:
+        return False
+
+    if _call("5. Running tick...", "POST", "/tick") is None:
+        return False
+
+    for name, identity_id in (("Alice", alice_id), ("Bob", bob_id)):
+        if _call(f"6. Messages for {name} ({identity_id})...", "GET", f"/messages/{identity_id}") is None:
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--skip-startup', action='store_true',
+                        help='Skip the demo startup check (needs textual)')
+    args = parser.parse_args()
+
+    os.environ.setdefault("CRYPTO_MODE", "dummy")
+    ok = True
+    if not args.skip_startup:
+        ok = check_demo_startup() and ok
+    ok = check_message_flow() and ok
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
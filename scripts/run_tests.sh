@@ -5,16 +5,31 @@ python3 -m venv .venv
 source .venv/bin/activate
 python -m pip install -U pip pyyaml rich pynacl textual >/dev/null
 
+# Protocol suites are independent (each uses its own .test_<protocol>.db
+# files and HANDLER_PATH), so run them in parallel and report in order.
+logdir=$(mktemp -d)
+trap 'rm -rf "$logdir"' EXIT
+
 # Framework tests
-python core/test_runner.py protocols/framework_tests
+python core/test_runner.py protocols/framework_tests >"$logdir/framework_tests.log" 2>&1 &
+framework_tests_pid=$!
 
 # SQL-first protocols use snapshot assertions
-export SNAPSHOT_ONLY=1
-python core/test_runner.py protocols/message_via_tor
+SNAPSHOT_ONLY=1 python core/test_runner.py protocols/message_via_tor >"$logdir/message_via_tor.log" 2>&1 &
+message_via_tor_pid=$!
 
 # Other protocols (signed_groups currently mixed; snapshot gradually preferred)
-unset SNAPSHOT_ONLY
-python core/test_runner.py protocols/signed_groups
+python core/test_runner.py protocols/signed_groups >"$logdir/signed_groups.log" 2>&1 &
+signed_groups_pid=$!
 
-echo "All tests done."
+status=0
+for suite in framework_tests message_via_tor signed_groups; do
+    pid_var="${suite}_pid"
+    if ! wait "${!pid_var}"; then
+        status=1
+    fi
+    cat "$logdir/$suite.log"
+done
 
+echo "All tests done."
+exit $status